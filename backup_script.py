@@ -1,117 +1,589 @@
 import os
-import requests
-import pandas as pd
-import json
-import re
+import asyncio
+import codecs
+import csv
+import functools
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import aiometer
+import diskcache
+import httpx
+import orjson
 import google.auth
+import google_auth_httplib2
+import httplib2
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload, MediaUpload
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_exponential_jitter,
+)
+
+logger = logging.getLogger(__name__)
 
 # --- CONFIGURATION ---
 MONDAY_API_KEY = os.getenv('MONDAY_API_KEY')
 GDRIVE_FOLDER_ID = os.getenv('GDRIVE_FOLDER_ID')
 
 MONDAY_API_URL = "https://api.monday.com/v2"
-HEADERS = {"Authorization": MONDAY_API_KEY}
+HEADERS = {
+    "Authorization": MONDAY_API_KEY,
+    "Content-Type": "application/json",
+}
+
+# Characters that are stripped from board names to build CSV file names.
+_FILENAME_TRANS = str.maketrans('', '', '\\/*?:"<>|')
+
+# Number of boards whose first item page is fetched in a single GraphQL request.
+BOARDS_PER_BATCH = 10
+ITEMS_PAGE_LIMIT = 500  # maximum allowed by monday.com
+# Only the item fields written to the CSV are requested.
+ITEM_FIELDS = 'id name column_values { id text }'
+
+# Maximum number of board batches fetched and uploaded at the same time.
+MAX_CONCURRENT_BATCHES = 2
+MAX_BATCHES_PER_SECOND = 1
+
+# Limits that apply to every monday.com query, including pagination, to stay
+# under monday.com's complexity budget (5,000,000 points per minute) and avoid
+# 429 responses.
+MAX_QUERIES_AT_ONCE = 8
+MAX_QUERIES_PER_SECOND = 4
+
+# Connection pool for api.monday.com. Requests are multiplexed over HTTP/2
+# where the server negotiates it, and connections are kept alive between
+# paginated queries instead of reconnecting for every request.
+MAX_CONNECTIONS = 20
+REQUEST_TIMEOUT = 60  # seconds
+
+# Backup state from previous runs: for each board, the updated_at timestamp
+# it had when it was last uploaded and the ID of the Drive file it was
+# uploaded to. Boards whose updated_at is unchanged are skipped. Only this
+# metadata is stored, never board contents, because the cache directory is
+# persisted through the GitHub Actions cache.
+CACHE_DIR = ".monday_cache"
+CACHE = diskcache.Cache(CACHE_DIR)
+# Bump whenever the shape of cached entries changes so old entries are ignored.
+CACHE_VERSION = 5
+
+# Google Drive uploads run on their own thread pool so that their network
+# waits overlap. googleapiclient services and httplib2 transports are not
+# thread-safe, so each upload thread builds its own on top of the shared
+# credentials and keeps reusing its connection for later uploads.
+MAX_UPLOAD_WORKERS = 8
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS, thread_name_prefix='gdrive-upload')
+_thread_local = threading.local()
+
+# CSVs below this size are sent in a single multipart request; larger ones use
+# a resumable upload in large chunks, each retried on its own on 5xx errors.
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_CHUNK_RETRIES = 5
+# Boards with more than one items page are streamed to Drive while they are
+# being paginated, with at most this many encoded pages waiting for the
+# upload thread.
+UPLOAD_QUEUE_PAGES = 4
+
+# Transient HTTP statuses that are retried for both monday.com and Google Drive.
+RETRY_STATUSES = (500, 502, 503, 504)
+MAX_ATTEMPTS = 5
+
+class RateLimitError(Exception):
+    """Raised when monday.com rejects a request because of rate limiting."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class ServerError(Exception):
+    """Raised when monday.com answers with a transient server error."""
+
+class QueryError(Exception):
+    """Raised when monday.com returns GraphQL errors for a query."""
+
+class QueryLimiter:
+    """Caps the number of monday.com queries in flight and spaces out their start times."""
+
+    def __init__(self, max_at_once, max_per_second):
+        self._semaphore = asyncio.Semaphore(max_at_once)
+        self._interval = 1 / max_per_second
+        self._next_start = 0.0
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next_start)
+        self._next_start = start + self._interval
+        try:
+            await asyncio.sleep(start - now)
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+QUERY_LIMITER = QueryLimiter(MAX_QUERIES_AT_ONCE, MAX_QUERIES_PER_SECOND)
+
+def parse_retry_after(value):
+    """Returns the number of seconds in a Retry-After header, or None if absent or not numeric."""
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+_query_backoff = wait_exponential(multiplier=0.5, max=60)
+
+def wait_for_monday(retry_state):
+    """Waits as long as monday.com's Retry-After asks for, otherwise backs off exponentially."""
+    retry_after = getattr(retry_state.outcome.exception(), 'retry_after', None)
+    if retry_after is not None:
+        return retry_after
+    return _query_backoff(retry_state)
+
+@retry(
+    wait=wait_for_monday,
+    retry=retry_if_exception_type((RateLimitError, ServerError, httpx.TransportError)),
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+async def run_query(client, query, variables=None):
+    """Posts a GraphQL query to monday.com, retrying on 429, 5xx, non-JSON responses and connection errors.
+
+    Every attempt goes through QUERY_LIMITER.
+    """
+    payload = {'query': query}
+    if variables:
+        payload['variables'] = variables
+    async with QUERY_LIMITER:
+        response = await client.post(MONDAY_API_URL, content=orjson.dumps(payload))
+    if response.status_code == 429:
+        raise RateLimitError(
+            "monday.com rate limit reached (HTTP 429)",
+            retry_after=parse_retry_after(response.headers.get('Retry-After')),
+        )
+    if response.status_code in RETRY_STATUSES:
+        raise ServerError(f"monday.com is temporarily unavailable (HTTP {response.status_code})")
+    response.raise_for_status()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # A 200 with a non-JSON body is an error page from a proxy or gateway
+        # in front of monday.com; treat it like a 5xx.
+        raise ServerError(f"monday.com returned a response that is not JSON: {e}") from e
 
-def get_all_boards():
+async def get_all_boards(client):
     """Fetches all boards from monday.com."""
-    query = '{ boards(limit: 500) { id name } }'
+    query = '{ boards(limit: 500) { id name updated_at } }'
     try:
-        response = requests.post(MONDAY_API_URL, json={'query': query}, headers=HEADERS)
-        response.raise_for_status()
-        boards = response.json()['data']['boards']
-        print(f"Found {len(boards)} boards.")
+        result = await run_query(client, query)
+        boards = result['data']['boards']
+        logger.info("Found %d boards.", len(boards))
         return boards
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching boards: {e}")
+    except (httpx.HTTPError, RateLimitError, ServerError) as e:
+        logger.error("Error fetching boards: %s", e)
         return []
 
-def get_board_data(board_id):
-    """DIAGNOSTIC VERSION: Fetches only item ID and name for a given board ID."""
-    
-    # --- THIS IS THE DIAGNOSTIC PART ---
-    # This query is the simplest possible request for items.
-    # It does NOT ask for any column_values.
-    items_query = f'''
-    {{
-      boards(ids: {board_id}) {{
-        items(limit: 5000) {{
-          id
-          name
-        }}
+async def get_boards_batch(client, board_ids):
+    """Fetches the columns and first page of items for several boards in a single request.
+
+    Each board is selected under its own alias so that every board keeps its own
+    pagination cursor. Returns a dict mapping board ID to its columns and first
+    items page for the boards that were fetched; boards that could not be
+    fetched (for example deleted since the board list was read, or named in a
+    GraphQL error) are logged and left out.
+    """
+    selections = ' '.join(
+        f'b{board_id}: boards(ids: [{board_id}]) {{ columns {{ id title }} '
+        f'items_page(limit: {ITEMS_PAGE_LIMIT}) {{ cursor items {{ {ITEM_FIELDS} }} }} }}'
+        for board_id in board_ids
+    )
+    batch_query = f'{{ {selections} }}'
+    try:
+        logger.info("Fetching first item page for boards %s...", ', '.join(board_ids))
+        result = await run_query(client, batch_query)
+    except (httpx.HTTPError, RateLimitError, ServerError) as e:
+        logger.error("Error fetching items for boards %s: %s", ', '.join(board_ids), e)
+        return {}
+
+    errors = result.get('errors') or []
+    # Errors that name an alias in their path only affect that board.
+    failed_aliases = {error['path'][0] for error in errors if error.get('path')}
+    data = result.get('data') or {}
+    first_pages = {}
+    for board_id in board_ids:
+        alias = f'b{board_id}'
+        boards = data.get(alias) or []
+        if boards and alias not in failed_aliases:
+            first_pages[board_id] = boards[0]
+        else:
+            reasons = [error for error in errors if (error.get('path') or [alias])[0] == alias]
+            logger.error("Could not fetch board %s: %s", board_id, reasons or "board not returned by monday.com")
+    return first_pages
+
+async def get_board_data(client, board_id, first_page):
+    """Yields the rows of a board one items page at a time, following the cursor from its first page.
+
+    Raises QueryError if monday.com returns GraphQL errors or no data for a page.
+    """
+    column_index = board_column_index(first_page)
+    next_page_query = f'''
+    query ($cursor: String!) {{
+      next_items_page(cursor: $cursor, limit: {ITEMS_PAGE_LIMIT}) {{
+        cursor
+        items {{ {ITEM_FIELDS} }}
       }}
     }}
     '''
-    try:
-        print("Attempting simplified item query...")
-        response = requests.post(MONDAY_API_URL, json={'query': items_query}, headers=HEADERS)
-        response.raise_for_status()
-        result = response.json()
+    items_page = first_page['items_page']
+    while True:
+        yield item_rows(items_page['items'], column_index)
+
+        cursor = items_page['cursor']
+        if not cursor:
+            return
+        result = await run_query(client, next_page_query, {'cursor': cursor})
         if "errors" in result:
-            print(f"Monday API Error: {result['errors']}")
-            return None
-        items_data = result['data']['boards'][0]['items']
-        print(f"Successfully fetched {len(items_data)} items (ID and Name only).")
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching items for board {board_id}: {e}")
-        return None
+            raise QueryError(f"Monday API Error for board {board_id}: {result['errors']}")
+        items_page = (result.get('data') or {}).get('next_items_page')
+        if items_page is None:
+            raise QueryError(f"Monday API returned no items page for board {board_id}")
+
+def board_column_index(first_page):
+    """Maps each of a board's column IDs to its position among the column values of a row."""
+    return {column['id']: i for i, column in enumerate(first_page['columns'])}
+
+def item_rows(items, column_index):
+    """Converts items to CSV rows, with column values in board column order."""
+    width = len(column_index)
+    rows = []
+    for item in items:
+        values = [None] * width
+        for col_val in item['column_values']:
+            i = column_index.get(col_val['id'])
+            if i is not None:
+                values[i] = col_val['text']
+        rows.append([item['id'], item['name'], *values])
+    return rows
+
+def csv_header(first_page):
+    """Returns the CSV header row for a board."""
+    return ['Item ID', 'Item Name'] + [column['title'] for column in first_page['columns']]
+
+def encode_csv_rows(rows):
+    """Encodes rows as UTF-8 CSV bytes."""
+    text = io.StringIO()
+    csv.writer(text).writerows(rows)
+    return text.getvalue().encode('utf-8')
+
+def get_backed_up_file_id(board):
+    """Returns the Drive file ID of the board's last backup if the board has not changed since."""
+    backup = CACHE.get(("backup", CACHE_VERSION, board['id']))
+    if backup and backup['updated_at'] == board['updated_at']:
+        return backup['file_id']
+    return None
+
+def record_backup(board, file_id):
+    """Remembers that the board, as of its current updated_at, is backed up in the given Drive file."""
+    CACHE.set(("backup", CACHE_VERSION, board['id']), {'updated_at': board['updated_at'], 'file_id': file_id})
 
-    # Process items into a list of dictionaries for the CSV
-    processed_rows = []
-    for item in items_data:
-        # We are only processing the name and ID.
-        row = {'Item ID': item['id'], 'Item Name': item['name']}
-        processed_rows.append(row)
-        
-    return processed_rows
-
-def upload_to_gdrive(service, file_path, folder_id):
-    """Uploads a file to a specific Google Drive folder."""
+def get_gdrive_service(credentials):
+    """Returns the Google Drive service for the current thread, building it on first use.
+
+    The Drive discovery document bundled with googleapiclient is used, so no
+    discovery request is made.
+    """
+    if not hasattr(_thread_local, 'gdrive_service'):
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=REQUEST_TIMEOUT))
+        _thread_local.gdrive_service = build('drive', 'v3', http=http, static_discovery=True)
+    return _thread_local.gdrive_service
+
+class UploadAborted(Exception):
+    """Raised in the upload thread when the board being streamed could not be fetched."""
+
+class StreamingCsvUpload(MediaUpload):
+    """Resumable Drive upload fed with CSV bytes from the event loop as pages arrive.
+
+    The event loop puts byte strings on an asyncio.Queue, then None once the
+    CSV is complete (or an exception to abort the upload); the upload thread
+    pulls them as Drive asks for the next chunk. Only the chunk that is not
+    yet acknowledged by Drive is kept in memory.
+
+    googleapiclient detects the end of a stream of unknown size from a short
+    read, which breaks when the CSV ends exactly on a chunk boundary. size()
+    therefore reads one byte past the next chunk and reports the exact size
+    as soon as the end of the stream is in the buffer.
+    """
+
+    def __init__(self, loop, queue, chunksize=UPLOAD_CHUNK_SIZE):
+        super().__init__()
+        self._loop = loop
+        self._queue = queue
+        self._chunksize = chunksize
+        self._buffer = bytearray()
+        self._offset = 0  # stream position of self._buffer[0]
+        self._served = 0  # stream position just after the last chunk handed out
+        self._eof = False
+        # Set by the upload thread once it has given up; the producer checks
+        # it to stop fetching pages that would only be discarded.
+        self.abandoned = False
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return 'text/csv'
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return False
+
+    def size(self):
+        self._fill(self._served + self._chunksize + 1)
+        return self._offset + len(self._buffer) if self._eof else None
+
+    def getbytes(self, begin, length):
+        if begin < self._offset:
+            raise UploadAborted("Drive asked for bytes that were already discarded")
+        # Everything before begin has been acknowledged by Drive.
+        del self._buffer[:begin - self._offset]
+        self._offset = begin
+        self._fill(begin + length)
+        chunk = bytes(self._buffer[:length])
+        self._served = begin + len(chunk)
+        return chunk
+
+    def drain(self):
+        """Consumes the rest of the stream so the producer never blocks on a finished upload."""
+        if not self._eof:
+            self.abandoned = True
+        while not self._eof:
+            self._buffer.clear()
+            try:
+                self._fill(self._offset + 1)
+            except UploadAborted:
+                pass
+
+    def _fill(self, end):
+        """Reads from the queue until the buffer reaches stream position end or the stream ends."""
+        while not self._eof and self._offset + len(self._buffer) < end:
+            data = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+            if data is None:
+                self._eof = True
+            elif isinstance(data, BaseException):
+                self._eof = True
+                raise data
+            else:
+                self._buffer += data
+
+def build_media(csv_file):
+    """Wraps a CSV file for upload, choosing a resumable upload for large files."""
+    size = csv_file.seek(0, os.SEEK_END)
+    csv_file.seek(0)
+    if size < RESUMABLE_UPLOAD_THRESHOLD:
+        return MediaIoBaseUpload(csv_file, mimetype='text/csv', resumable=False)
+    return MediaIoBaseUpload(csv_file, mimetype='text/csv', chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+
+def is_transient_drive_error(exception):
+    """Returns True for Google Drive errors that are worth retrying."""
+    return isinstance(exception, HttpError) and exception.resp.status in (429,) + RETRY_STATUSES
+
+def create_gdrive_file(service, file_metadata, media):
+    """Creates a file in Google Drive from a media object and returns its metadata."""
+    # Drive's batch endpoint rejects media uploads, so each file is created
+    # with its own request; concurrency comes from UPLOAD_EXECUTOR instead.
+    request = service.files().create(body=file_metadata, media_body=media, fields='id')
+    if not media.resumable():
+        return request.execute()
+    file = None
+    while file is None:
+        _, file = request.next_chunk(num_retries=UPLOAD_CHUNK_RETRIES)
+    return file
+
+@retry(
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception(is_transient_drive_error),
+    stop=stop_after_attempt(MAX_ATTEMPTS),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True,
+)
+def create_gdrive_file_with_retry(service, file_metadata, media):
+    """Creates a file in Google Drive like create_gdrive_file, retrying the whole upload on transient errors.
+
+    Only for media that can be read again from the start; streamed media cannot.
+    """
+    return create_gdrive_file(service, file_metadata, media)
+
+def upload_to_gdrive(credentials, media, filename, folder_id):
+    """Uploads a media object as a file in a specific Google Drive folder.
+
+    Returns the ID of the new file, or None if the upload failed.
+    """
     file_metadata = {
-        'name': os.path.basename(file_path),
+        'name': filename,
         'parents': [folder_id]
     }
-    media = MediaFileUpload(file_path, mimetype='text/csv')
     try:
-        file = service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-        print(f"Successfully uploaded {os.path.basename(file_path)} to Google Drive. File ID: {file.get('id')}")
-    except Exception as e:
-        print(f"Error uploading {os.path.basename(file_path)} to Google Drive: {e}")
+        service = get_gdrive_service(credentials)
+        if isinstance(media, StreamingCsvUpload):
+            file = create_gdrive_file(service, file_metadata, media)
+        else:
+            file = create_gdrive_file_with_retry(service, file_metadata, media)
+        logger.info("Successfully uploaded %s to Google Drive. File ID: %s", filename, file.get('id'))
+        return file.get('id')
+    except UploadAborted as e:
+        logger.warning("Upload of %s to Google Drive abandoned: %s", filename, e)
+    except Exception:
+        logger.exception("Error uploading %s to Google Drive.", filename)
+    finally:
+        if isinstance(media, StreamingCsvUpload):
+            media.drain()
+    return None
+
+async def upload_single_page_board(credentials, board, first_page, filename):
+    """Uploads a board whose items all fit in its first page to Google Drive as CSV.
+
+    The CSV is built in memory and uploaded with build_media, so transient
+    Drive errors are retried. Returns the ID of the uploaded Drive file, or
+    None if the upload failed.
+    """
+    rows = item_rows(first_page['items_page']['items'], board_column_index(first_page))
+    csv_file = io.BytesIO(codecs.BOM_UTF8 + encode_csv_rows([csv_header(first_page), *rows]))
+    logger.info("Successfully fetched %d items for board %s.", len(rows), board['id'])
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        UPLOAD_EXECUTOR, upload_to_gdrive, credentials, build_media(csv_file), filename, GDRIVE_FOLDER_ID
+    )
+
+async def stream_board(client, credentials, board, first_page, filename):
+    """Streams a board from monday.com to Google Drive as CSV, one items page at a time.
+
+    Each page is encoded and handed to the upload thread while the next page is
+    fetched, so the upload starts before the board is complete. Returns the ID
+    of the uploaded Drive file, or None if the board could not be backed up.
+    """
+    board_id = board['id']
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_PAGES)
+    media = StreamingCsvUpload(loop, queue)
+    # The Google API client is synchronous, so run the upload on the upload pool.
+    upload = loop.run_in_executor(UPLOAD_EXECUTOR, upload_to_gdrive, credentials, media, filename, GDRIVE_FOLDER_ID)
+    completed = False
+    row_count = 0
+    data = codecs.BOM_UTF8 + encode_csv_rows([csv_header(first_page)])
+    try:
+        async for rows in get_board_data(client, board_id, first_page):
+            # The upload future only completes once the stream has ended,
+            # because a failed upload keeps draining the queue; check the
+            # media instead so a failed upload stops the pagination.
+            if media.abandoned:
+                logger.warning("Stopped fetching board %s because its upload failed.", board_id)
+                break
+            data += encode_csv_rows(rows)
+            await queue.put(data)
+            data = b''
+            row_count += len(rows)
+        else:
+            completed = True
+            logger.info("Successfully fetched %d items for board %s.", row_count, board_id)
+    except (httpx.HTTPError, RateLimitError, ServerError, QueryError) as e:
+        logger.error("Error fetching items for board %s: %s", board_id, e)
+    except Exception:
+        # Anything else is a bug or an unexpected response; log it and move
+        # on so that one board does not abort the whole backup.
+        logger.exception("Unexpected error fetching items for board %s.", board_id)
+    finally:
+        # The upload thread must always see the end of the stream and finish
+        # before the event loop it reads from can go away.
+        await queue.put(None if completed else UploadAborted(f"board {board_id} could not be fetched"))
+        file_id = await upload
+    return file_id if completed else None
+
+async def process_board(client, credentials, board, first_page):
+    """Fetches a board from monday.com and uploads it to Google Drive as CSV."""
+    board_id = board['id']
+    board_name = board['name']
+    if first_page is None:
+        logger.error("Skipping board '%s' (ID: %s): it could not be fetched.", board_name, board_id)
+        return
+    if not first_page['items_page']['items']:
+        logger.info("No data to process for board '%s'.", board_name)
+        return
+    logger.info("--- Processing Board: %s (ID: %s) ---", board_name, board_id)
+    filename = f"{board_name.translate(_FILENAME_TRANS)}.csv"
+    if first_page['items_page']['cursor']:
+        file_id = await stream_board(client, credentials, board, first_page, filename)
+    else:
+        file_id = await upload_single_page_board(credentials, board, first_page, filename)
+    if file_id:
+        record_backup(board, file_id)
+
+async def process_batch(client, credentials, boards):
+    """Fetches a batch of boards with one request, then finishes each board concurrently.
+
+    Boards that have not changed since their last successful backup are skipped.
+    """
+    stale = []
+    for board in boards:
+        file_id = get_backed_up_file_id(board)
+        if file_id:
+            logger.info(
+                "Board %s unchanged since %s, already backed up as Drive file %s.",
+                board['id'], board['updated_at'], file_id,
+            )
+        else:
+            stale.append(board)
+    if not stale:
+        return
+    first_pages = await get_boards_batch(client, [board['id'] for board in stale])
+    await asyncio.gather(*(
+        process_board(client, credentials, board, first_pages.get(board['id']))
+        for board in stale
+    ))
 
-def main():
+async def main():
     """Main function to run the backup process."""
     if not all([MONDAY_API_KEY, GDRIVE_FOLDER_ID]):
-        print("Error: Missing one or more required environment variables.")
+        logger.error("Missing one or more required environment variables.")
         return
 
     try:
         credentials, project = google.auth.default(scopes=['https://www.googleapis.com/auth/drive'])
-        gdrive_service = build('drive', 'v3', credentials=credentials)
     except Exception as e:
-        print(f"Error authenticating with Google Cloud: {e}")
-        return
-        
-    boards = get_all_boards()
-    if not boards:
-        print("No boards found or error fetching boards. Exiting.")
+        logger.error("Error authenticating with Google Cloud: %s", e)
         return
 
-    for board in boards:
-        board_id = board['id']
-        board_name = board['name']
-        print(f"\n--- Processing Board: {board_name} (ID: {board_id}) ---")
-        board_data = get_board_data(board_id)
-        if board_data:
-            safe_board_name = re.sub(r'[\\/*?:"<>|]', "", board_name)
-            filename = f"{safe_board_name} (Basic).csv"
-            df = pd.DataFrame(board_data)
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
-            print(f"Created CSV file: {filename} with {len(df)} rows.")
-            upload_to_gdrive(gdrive_service, filename, GDRIVE_FOLDER_ID)
-            os.remove(filename)
-        else:
-            print(f"No data to process for board '{board_name}'.")
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+    async with httpx.AsyncClient(http2=True, headers=HEADERS, limits=limits, timeout=REQUEST_TIMEOUT) as client:
+        boards = await get_all_boards(client)
+        if not boards:
+            logger.error("No boards found or error fetching boards. Exiting.")
+            return
+
+        batches = [boards[i:i + BOARDS_PER_BATCH] for i in range(0, len(boards), BOARDS_PER_BATCH)]
+        async with aiometer.amap(
+            functools.partial(process_batch, client, credentials),
+            batches,
+            max_at_once=MAX_CONCURRENT_BATCHES,
+            max_per_second=MAX_BATCHES_PER_SECOND,
+        ) as results:
+            async for _ in results:
+                pass
 
 if __name__ == "__main__":
-    main()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(threadName)s %(name)s: %(message)s",
+    )
+    asyncio.run(main())